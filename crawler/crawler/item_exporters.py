@@ -10,58 +10,142 @@ More Info:
 
 """
 
+import io
 import os
-from scrapy.utils.serialize import ScrapyJSONEncoder
+import threading
+import orjson
+import zstandard
+from itemadapter import ItemAdapter
 from scrapy.exporters import BaseItemExporter
-from scrapy.utils.python import to_bytes
+
+# Size of the user-space buffer of each json lines file, items are only handed to the kernel once it is full
+BUFFER_SIZE = 1 << 20
+
+# zstd level used to compress the json lines files, low levels are cheap on CPU and still shrink json several times
+COMPRESSION_LEVEL = 3
+
+# Name of the json lines file, inside the spider's folder, for items that don't have any article_type left, such as
+# pages without breadcrumbs or breadcrumbs that only had Home
+UNCATEGORIZED = "uncategorized"
 
 
 class JsonLinesItemSplitFileExporter(BaseItemExporter):
 
     """An item exporter to organize json lines into separate folders.
 
+    Every line is utf-8 encoded json terminated with a single line feed byte on every platform, as the json lines format
+    requires, so the encoding option is not used. The lines are zstd compressed on the way out, so each json lines file
+    is written as item_path + ".zst". Every crawl appends its own zstd frame, and a file made of several frames still
+    decompresses into all the lines. If batch_item_count is set, a frame is also finished and flushed to disk after
+    every batch_item_count items of a file, so finished batches can be read while the crawl is still running.
+
     Attributes:
         _configure (func): Uses to configure the Item Exporter by setting the options dictionary.
-        encoder (ScrapyJSONEncoder): Encoder used to convert scrapy items into a json format line.
+        batch_item_count (int): Number of items per zstd frame for each file, 0 only finishes frames at the end.
+        _dumps (func): orjson.dumps, used to convert scrapy items straight into utf-8 encoded json bytes.
+        _path_cache (dict): Json lines file paths keyed by spider name and article_type, since most items share one.
+        _files (dict): Open zstd stream writers and the buffered files underneath them, as tuples keyed by the json
+            lines file path, kept open until finish_exporting.
+        _dirs_created (set): Folders that have already been created by this exporter.
+        _batch_counts (dict): Number of items written to the current frame, keyed by the json lines file path.
+        _lock (threading.Lock): Guards _path_cache, _files, _dirs_created, _batch_counts and the writes, since items
+            are exported from a thread pool and the zstd stream writers are not thread safe.
 
     """
 
     def __init__(self, **kwargs):
-        """Initialize the configuration dictionary and encoder.
+        """Initialize the configuration dictionary and serializer.
 
         Args:
-            **kwargs: Arbitrary keyword arguments for the options dictionary.
+            **kwargs: Arbitrary keyword arguments for the options dictionary, batch_item_count sets the number of items
+                per zstd frame.
         """
+        self.batch_item_count = kwargs.pop('batch_item_count', 0)
+
         # If dont_fail is set, it won't raise an exception on unexpected options
         self._configure(kwargs, dont_fail=True)
-        kwargs.setdefault('ensure_ascii', not self.encoding)
-        self.encoder = ScrapyJSONEncoder()
+        self._dumps = orjson.dumps
+        self._path_cache = {}
+        self._files = {}
+        self._dirs_created = set()
+        self._batch_counts = {}
+        self._lock = threading.Lock()
         super(JsonLinesItemSplitFileExporter, self).__init__()
 
     def export_item(self, item):
         """Export Scrapy items to specific files based on the article_type.
 
         Args:
-            item (scrapy.Item): A Scrapy item that contains a complete scraped information for an article/product.
+            item (NordstromItem or AsosItem): A Scrapy item that contains a complete scraped information for an
+                article/product.
+
+        """
+        # Serialize the item into a python dictionary, then dump it into json bytes. orjson emits utf-8 bytes directly,
+        # so there is no intermediate str to re-encode before writing, and it appends the newline itself, so the line
+        # isn't copied again just to add it. Anything orjson can't handle natively falls back to its str(). Fields that
+        # were never loaded are None on our attrs items, they are left out so that the lines only have scraped fields.
+        adapter = ItemAdapter(item)
+        item_dict = {name: self.serialize_field(adapter.get_field_meta(name), name, value)
+                     for name, value in adapter.items() if value is not None}
+        data = self._dumps(item_dict, default=str, option=orjson.OPT_APPEND_NEWLINE)
+
+        # Reuse the file if we already opened it, otherwise create the folders and open it once. Sibling article types
+        # share their folders, so remember which ones exist to only create them once. Each file gets its own compressor
+        # since a compressor can only drive one stream at a time. The compressed output is collected in a 1 MiB buffer
+        # and written in batches, so most items never reach the kernel on their own
+        with self._lock:
+            item_path = self._item_path(adapter)
+            fp, _ = self._files.get(item_path, (None, None))
+            if fp is None:
+                path = os.path.dirname(item_path)
+                if path not in self._dirs_created:
+                    os.makedirs(path, exist_ok=True)
+                    self._dirs_created.add(path)
+                raw = io.BufferedWriter(io.FileIO(item_path + ".zst", 'ab'), buffer_size=BUFFER_SIZE)
+                fp = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).stream_writer(raw)
+                self._files[item_path] = (fp, raw)
+            fp.write(data)
+
+            # Finish the frame once a batch is complete, which also flushes the buffered file underneath
+            if self.batch_item_count:
+                count = self._batch_counts.get(item_path, 0) + 1
+                if count >= self.batch_item_count:
+                    fp.flush(zstandard.FLUSH_FRAME)
+                    count = 0
+                self._batch_counts[item_path] = count
+
+    def _item_path(self, adapter):
+        """Get the json lines file path for the item's article_type.
+
+        Args:
+            adapter (itemadapter.ItemAdapter): An adapter around the Scrapy item that contains a complete scraped
+                information for an article/product.
+
+        Returns:
+            item_path (str): Path of the json lines file the item should be written to.
 
         """
-        # Serialize the item, and perform encoding to create a python dictionary
-        item_dict = dict(self._get_serialized_fields(item))
-        data = self.encoder.encode(item_dict) + os.linesep
-
-        # If there is only one item in article_type, then the path (folders) would just be
-        # scraped_data/spider.name/article_type. Otherwise we would combine all the article_type list except the last
-        # item into a path, such as scraped_data/spider.name/article_type[0]/article_type[1], then the item would be
-        # a json line placed in scraped_data/spider.name/article_type[0]/article_type[1]/article_type[2].jl.
-        if len(item['article_type']) == 1:
-            path = os.path.join("scraped_data", item["spider_name"])
-            item_path = os.path.join(path, item['article_type'][0]) + ".jl"
-        else:
-            path = os.path.join(os.path.join("scraped_data", item["spider_name"]),
-                                (os.path.join(*item['article_type'][:-1])))
-            item_path = os.path.join(path, item['article_type'][-1]) + ".jl"
-        if not os.path.exists(path):
-            os.makedirs(path)
-
-        # Write in append and byte mode
-        open(item_path, 'a+b').write(to_bytes(data, self.encoding))
+        key = (adapter['spider_name'], tuple(adapter.get('article_type') or ()))
+        item_path = self._path_cache.get(key)
+        if item_path is None:
+            # All the article_type list except the last item is combined into a path, such as
+            # scraped_data/spider.name/article_type[0]/article_type[1], then the item would be a json line placed in
+            # scraped_data/spider.name/article_type[0]/article_type[1]/article_type[2].jl. If there is only one item
+            # in article_type, then the file is just scraped_data/spider.name/article_type[0].jl, and if there is none
+            # it goes into scraped_data/spider.name/uncategorized.jl instead of next to the spider's folder.
+            item_path = os.path.join("scraped_data", key[0], *(key[1] or (UNCATEGORIZED,))) + ".jl"
+            self._path_cache[key] = item_path
+        return item_path
+
+    def finish_exporting(self):
+        """Finish the zstd frame and close every json lines file that was opened while exporting."""
+        with self._lock:
+            # Closing a stream writer finishes its frame and closes the buffered file underneath. If a batch has just
+            # finished the frame, there is nothing left to put in a frame, so only the buffered file is closed
+            for item_path, (fp, raw) in self._files.items():
+                if self.batch_item_count and not self._batch_counts[item_path]:
+                    raw.close()
+                else:
+                    fp.close()
+            self._files.clear()
+            self._batch_counts.clear()
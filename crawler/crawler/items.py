@@ -7,85 +7,106 @@ can return the extracted data as Python dicts. While convenient and familiar, Py
 To define common output data format Scrapy provides the Item class. Item objects are simple containers used to collect
 the scraped data. They provide a dictionary-like API with a convenient syntax for declaring their available fields.
 
+Scrapy also accepts attrs classes as items. The items here are slotted attrs classes, which store each field in a slot
+instead of a per-instance dict, so they use less memory when many items are in flight. The input and output processors
+are declared in each field's metadata, which is where ItemLoader looks for them. Fields that were never loaded stay
+None and are left out of the exported json lines, just like unset fields of a scrapy.Item. image_urls defaults to an
+empty list, because the images pipeline iterates over it even when a product page has no images.
+
 More Info:
     https://doc.scrapy.org/en/latest/topics/items.html
 
 """
 
-import scrapy
-from scrapy.loader.processors import TakeFirst
-from scrapy.loader.processors import MapCompose
+import attr
+from itemloaders.processors import TakeFirst
+from itemloaders.processors import MapCompose
 from w3lib.url import url_query_cleaner
 from .processors import RemoveSaleHome
 
 
-class NordstromItem(scrapy.Item):
+def _strip_first(value):
+    """Strip the first character, which is the currency symbol of a price such as $39.00.
 
-    """Scrapy item to store scraped data from Nordstrom.com.
+    Args:
+        value (str): A price scraped from the webpage.
 
-    Attributes:
-        article_type (scrapy.Field): List of the associated article type, for example: ['women', 'sports'].
-        product_name (scrapy.Field): Str of the product name, for example: Cage Strap Tank.
-        product_url (scrapy.Field): Str of the url of the product.
-        brand_name (scrapy.Field): Str of associated brand of the product, for example: Zella.
-        price (scrapy.Field): String of the price of the product.
-        fit (scrapy.Field): List of the different sizes for the product.
-        width (scrapy.Field): List of different width for the product, this is sometimes used in shoes.
-        colors (scrapy.Field): List of colros for the product.
-        size_info (scrapy.Field): List of information given for the size.
-        details_and_care_info (scrapy.Field): List of care information for the product.
-        details_and_care_list (scrapy.Field): List of care and details information.
-        image_urls (scrapy.Field): List of urls of the images.
-        images (scrapy.Field): List of hashes for corresponding image_urls.
-        spider_name (scrapy.Field): Str of spider name.
+    Returns:
+        value (str): The price without the currency symbol.
 
     """
+    return value[1:]
 
-    article_type = scrapy.Field(output_processor=RemoveSaleHome())
-    product_name = scrapy.Field(output_processor=TakeFirst())
-    product_url = scrapy.Field(output_processor=TakeFirst())
-    brand_name = scrapy.Field(output_processor=TakeFirst())
-    price = scrapy.Field(output_processor=MapCompose(lambda x: x[1:]))
-    fit = scrapy.Field()
-    width = scrapy.Field()
-    colors = scrapy.Field()
-    size_info = scrapy.Field()
-    details_and_care_info = scrapy.Field()
-    details_and_care_list = scrapy.Field()
-    image_urls = scrapy.Field(output_processor=MapCompose(lambda x: url_query_cleaner(x)))
-    images = scrapy.Field()
-    spider_name = scrapy.Field(output_processor=TakeFirst())
 
+@attr.s(slots=True)
+class NordstromItem(object):
+
+    """Scrapy item to store scraped data from Nordstrom.com.
+
+    Attributes:
+        article_type (attr.ib): List of the associated article type, for example: ['women', 'sports'].
+        product_name (attr.ib): Str of the product name, for example: Cage Strap Tank.
+        product_url (attr.ib): Str of the url of the product.
+        brand_name (attr.ib): Str of associated brand of the product, for example: Zella.
+        price (attr.ib): String of the price of the product.
+        fit (attr.ib): List of the different sizes for the product.
+        width (attr.ib): List of different width for the product, this is sometimes used in shoes.
+        colors (attr.ib): List of colros for the product.
+        size_info (attr.ib): List of information given for the size.
+        details_and_care_info (attr.ib): List of care information for the product.
+        details_and_care_list (attr.ib): List of care and details information.
+        image_urls (attr.ib): List of urls of the images.
+        images (attr.ib): List of hashes for corresponding image_urls.
+        spider_name (attr.ib): Str of spider name.
+
+    """
 
-class AsosItem(scrapy.Item):
+    article_type = attr.ib(default=None, metadata={"output_processor": RemoveSaleHome()})
+    product_name = attr.ib(default=None, metadata={"output_processor": TakeFirst()})
+    product_url = attr.ib(default=None, metadata={"output_processor": TakeFirst()})
+    brand_name = attr.ib(default=None, metadata={"output_processor": TakeFirst()})
+    price = attr.ib(default=None, metadata={"output_processor": MapCompose(_strip_first)})
+    fit = attr.ib(default=None)
+    width = attr.ib(default=None)
+    colors = attr.ib(default=None)
+    size_info = attr.ib(default=None)
+    details_and_care_info = attr.ib(default=None)
+    details_and_care_list = attr.ib(default=None)
+    image_urls = attr.ib(default=attr.Factory(list), metadata={"output_processor": MapCompose(url_query_cleaner)})
+    images = attr.ib(default=None)
+    spider_name = attr.ib(default=None, metadata={"output_processor": TakeFirst()})
+
+
+@attr.s(slots=True)
+class AsosItem(object):
 
     """Scrapy item to store scraped data from asos.com.
 
     Attributes:
-        article_type (scrapy.Field): List of the associated article type, for example: ['women', 'shoes'].
-        product_name (scrapy.Field): Str of the product name, for example: New Look Satin Twist Slider.
-        product_url (scrapy.Field): Str of the url of the product.
-        brand_name (scrapy.Field): Str of associated brand of the product, for example: New Look.
-        price (scrapy.Field): String of the price of the product.
-        fit (scrapy.Field): List of the different sizes for the product.
-        colors (scrapy.Field): List of colors for the product.
-        details_and_care_info (scrapy.Field): List of care information for the product.
-        details_and_care_list (scrapy.Field): List of care and details information.
-        image_urls (scrapy.Field): List of urls of the images.
-        images (scrapy.Field): List of hashes for corresponding image_urls.
-        spider_name (scrapy.Field): Str of spider name.
+        article_type (attr.ib): List of the associated article type, for example: ['women', 'shoes'].
+        product_name (attr.ib): Str of the product name, for example: New Look Satin Twist Slider.
+        product_url (attr.ib): Str of the url of the product.
+        brand_name (attr.ib): Str of associated brand of the product, for example: New Look.
+        price (attr.ib): String of the price of the product.
+        fit (attr.ib): List of the different sizes for the product.
+        colors (attr.ib): List of colors for the product.
+        details_and_care_info (attr.ib): List of care information for the product.
+        details_and_care_list (attr.ib): List of care and details information.
+        image_urls (attr.ib): List of urls of the images.
+        images (attr.ib): List of hashes for corresponding image_urls.
+        spider_name (attr.ib): Str of spider name.
 
     """
 
-    article_type = scrapy.Field(output_processor=RemoveSaleHome())
-    product_name = scrapy.Field(output_processor=TakeFirst())
-    product_url = scrapy.Field(output_processor=TakeFirst())
-    brand_name = scrapy.Field(output_processor=TakeFirst())
-    price = scrapy.Field(output_processor=TakeFirst())
-    fit = scrapy.Field()
-    colors = scrapy.Field(output_processor=TakeFirst())
-    details_and_care_info = scrapy.Field(output_processor=TakeFirst())
-    details_and_care_list = scrapy.Field(output_processor=TakeFirst())
-    image_urls = scrapy.Field(output_processor=MapCompose(lambda x: url_query_cleaner(x)))
-    images = scrapy.Field()
-    spider_name = scrapy.Field(output_processor=TakeFirst())
+    article_type = attr.ib(default=None, metadata={"output_processor": RemoveSaleHome()})
+    product_name = attr.ib(default=None, metadata={"output_processor": TakeFirst()})
+    product_url = attr.ib(default=None, metadata={"output_processor": TakeFirst()})
+    brand_name = attr.ib(default=None, metadata={"output_processor": TakeFirst()})
+    price = attr.ib(default=None, metadata={"output_processor": TakeFirst()})
+    fit = attr.ib(default=None)
+    colors = attr.ib(default=None, metadata={"output_processor": TakeFirst()})
+    details_and_care_info = attr.ib(default=None, metadata={"output_processor": TakeFirst()})
+    details_and_care_list = attr.ib(default=None, metadata={"output_processor": TakeFirst()})
+    image_urls = attr.ib(default=attr.Factory(list), metadata={"output_processor": MapCompose(url_query_cleaner)})
+    images = attr.ib(default=None)
+    spider_name = attr.ib(default=None, metadata={"output_processor": TakeFirst()})
@@ -9,6 +9,7 @@ More Info:
 """
 
 from scrapy import signals
+from twisted.internet.threads import deferToThread
 from .item_exporters import JsonLinesItemSplitFileExporter
 
 
@@ -24,9 +25,15 @@ class FashionSiteExportPipeline(object):
 
     """
 
-    def __init__(self):
-        """Set up exporter to export items into json lines."""
-        self.exporter = JsonLinesItemSplitFileExporter()
+    def __init__(self, batch_item_count=0):
+        """Set up exporter to export items into json lines.
+
+        Args:
+            batch_item_count (int): Number of items the exporter writes to a file before it finishes a zstd frame and
+                flushes it to disk, 0 only does this when the spider is closed.
+
+        """
+        self.exporter = JsonLinesItemSplitFileExporter(batch_item_count=batch_item_count)
 
     @classmethod
     def from_crawler(cls, crawler):
@@ -43,7 +50,7 @@ class FashionSiteExportPipeline(object):
             pipeline (FashionSiteExportPipeline): A pipeline instance.
 
         """
-        pipeline = cls()
+        pipeline = cls(crawler.settings.getint("SPLIT_EXPORT_BATCH_ITEM_COUNT"))
         crawler.signals.connect(pipeline.spider_opened, signals.spider_opened)
         crawler.signals.connect(pipeline.spider_closed, signals.spider_closed)
         return pipeline
@@ -75,14 +82,19 @@ class FashionSiteExportPipeline(object):
         """Process the item sent from the a spider.
 
         When a spider finishes crawling a website and yield an item, then this item will be sent to the process_item
-        function. Then we will need to use the exporter to export the item given from the spider.
+        function. Then we will need to use the exporter to export the item given from the spider. The export runs in
+        the reactor's thread pool, so the blocking file I/O doesn't hold up the requests that are being crawled.
 
         Args:
             item (list or str): A list or str depending on if there's a list of item or only one item (then it is only
                 a string).
             spider (scrapy.spiders.Spider): A Scrapy spider instance.
 
+        Returns:
+            deferred (twisted.internet.defer.Deferred): Fires with the item once it has been exported.
+
         """
         spider.logger.info(f"{self.__class__.__name__} process_item {item}")
-        self.exporter.export_item(item)
-        return item
+        deferred = deferToThread(self.exporter.export_item, item)
+        deferred.addCallback(lambda _: item)
+        return deferred
@@ -28,9 +28,10 @@ class RemoveSaleHome(object):
 
         """
         # Note that we must check for sale first, otherwise a pop(0) will let sale keyword become the 0th index, and
-        # we would not be able to remove it.
-        if "sale" in values[1].lower():
+        # we would not be able to remove it. The breadcrumbs start with the keyword, so a case-insensitive check on the
+        # first four characters is enough, and breadcrumbs that are too short are left alone.
+        if len(values) > 1 and values[1][:4].casefold() == "sale":
             values.pop(1)
-        if "home" in values[0].lower():
+        if values and values[0][:4].casefold() == "home":
             values.pop(0)
         return values
@@ -76,6 +76,11 @@ ITEM_PIPELINES = {
     'scrapy.pipelines.images.ImagesPipeline': 300
 }
 
+# Split Export Settings Configuration
+# Number of items FashionSiteExportPipeline writes to each json lines file before finishing a zstd frame and flushing
+# it to disk, set it to 0 to only do this when the spider is closed
+SPLIT_EXPORT_BATCH_ITEM_COUNT = 1000
+
 # Image Settings Configuration
 IMAGES_STORE = 'images'
 
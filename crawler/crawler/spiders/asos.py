@@ -1,14 +1,51 @@
 """Spider used to scrape asos.com products/articles."""
 
-import json
 import logging
 from logging.handlers import RotatingFileHandler
 import os
 import re
+import orjson
 import scrapy
 from scrapy.loader import ItemLoader
+from parsel.csstranslator import HTMLTranslator
 from ..items import AsosItem
 
+# The product's json blob is passed to view('{...}', inside the script that loads Pages/FullProduct. It is searched for
+# directly in the raw response body, the json itself has to sit on one line just like with the old script text regex.
+# Neither the gap between Pages/FullProduct and view(' nor the json can run past a script tag, so the match stays inside
+# one script like the old XPath did. A Pages/FullProduct mentioned elsewhere, such as in a preload link, can't pick up a
+# view(' call from a different script, and on minified pages the json can't run on into a later script.
+_PRODUCT_RE = re.compile(rb"Pages/FullProduct(?:(?!</?script)(?s:.))*?view\('(\{(?:(?!</script).)*\})',")
+
+# Runs of backslashes in front of a quote break json parsing. A double quote keeps exactly one backslash so it stays
+# escaped inside the json string, while a single quote doesn't need escaping in json, so its backslashes are dropped.
+_BACKSLASH_FIX = re.compile(rb'[\\]+(["\'])')
+_BACKSLASH_REPLACEMENTS = {b'"': b'\\"', b"'": b"'"}
+
+
+def _load_product_json(body):
+    """Load the product's json blob from an asos product page.
+
+    The regex runs over the body bytes, so no text node has to be built for the script, and the data stays as utf-8
+    bytes all the way to orjson.
+
+    Args:
+        body (bytes): The body of a product page response.
+
+    Returns:
+        data_json (dict): The product json, or None if the page doesn't have one, such as set product pages.
+
+    """
+    product = _PRODUCT_RE.search(body)
+    if not product:
+        return None
+
+    # Avoid backslash bugs, which would give error when loading json files
+    data_cleaned = _BACKSLASH_FIX.sub(lambda match: _BACKSLASH_REPLACEMENTS[match.group(1)], product.group(1))
+
+    # orjson parses the bytes directly and returns the same dict/list tree as json.loads
+    return orjson.loads(data_cleaned)
+
 
 class AsosSpider(scrapy.Spider):
 
@@ -21,12 +58,24 @@ class AsosSpider(scrapy.Spider):
     Attributes:
         name (str): The name of the spider.
         start_urls (list): The urls to crawl from the start.
+        _XP (dict): XPath expressions for the item fields, precomputed from the CSS selectors in _SEL.
 
     """
 
     name = "asos"
     start_urls = ['http://us.asos.com/']
 
+    # CSS selectors used by parse_item, translated into XPath once for the class rather than on every response
+    _SEL = {
+        "article_type": "div.asos-product div.bread-crumb ul li a::text",
+        "product_name": "h1::text",
+        "brand_name": "div.product-description span a strong::text",
+        "details_and_care_info": "div.about-me span::text",
+        "details_and_care_list": "div.care-info span::text",
+        "image_urls": "li a img::attr(src)",
+    }
+    _XP = {field: HTMLTranslator().css_to_xpath(css) for field, css in _SEL.items()}
+
     def __init__(self):
         """Initialize the spider by setting up the logger and make sure the directory exists for the logger."""
         super(AsosSpider, self).__init__()
@@ -45,7 +94,7 @@ class AsosSpider(scrapy.Spider):
         """
         # Collect all article types on asos homepage, such as women->shoes, which are placed in an li html tag,
         # inside li tags have an attribute href that allow us to move to the next page
-        for article in response.css("div[class=sub-floor-menu] li a::attr(href)").extract():
+        for article in response.css("div[class=sub-floor-menu] li a::attr(href)").getall():
             request = scrapy.Request(article, callback=self.parse_article)
             yield request
 
@@ -58,7 +107,7 @@ class AsosSpider(scrapy.Spider):
         """
         # After reach in each article, start collecting all product links to each product under the articles
         # that have href tag, meaning it leads to a product link, such as women->shoes->New Look Satin Twist Slider.
-        for product_url in response.css("a.product.product-link::attr(href)").extract():
+        for product_url in response.css("a.product.product-link::attr(href)").getall():
             request = scrapy.Request(product_url, callback=self.parse_item)
             yield request
 
@@ -70,44 +119,31 @@ class AsosSpider(scrapy.Spider):
 
         """
         # Prepare data for json loads, because price, color, and size need to be extracted from json
-        data = response.xpath('//script[contains(., "Pages/FullProduct")]/text()').re_first(r"view\('(\{.*\})',")
+        data_json = _load_product_json(response.body)
 
-        # Avoid set products pages, which would give error when doing re.sub() afterwards
-        if not data:
+        # Avoid set products pages, which don't have the product json
+        if data_json is None:
             return
 
-        # Avoid backslash bugs, which would give error when loading json files
-        data_cleaned = re.sub(r'[\\]+"', r'\"', data)
-        data_cleaned = re.sub(r"[\\]+'", r"'", data_cleaned)
-
-        # Load json files for the purpose to extract price, color and size
-        data_json = json.loads(data_cleaned)
-
-        # Create size_list as a list and color_set as a set to avoid repetition
-        sizes = set()
-        colors = set()
-
-        # Iterate through variants to collect sizes and colors
-        for variant in data_json['variants']:
-            sizes.add(variant['size'])
-            colors.add(variant['colour'])
-        sizes = list(sizes)
-        colors = list(colors)
+        # Collect sizes and colors from the variants, going through a set comprehension to avoid repetition
+        variants = data_json['variants']
+        sizes = list({variant['size'] for variant in variants})
+        colors = list({variant['colour'] for variant in variants})
 
         # Create an item loader in order to add data into our Scrapy items.
         loader = ItemLoader(item=AsosItem(), response=response)
 
         # Get the article type from the last page through meta
-        loader.add_css("article_type", "div.asos-product div.bread-crumb ul li a::text")
+        loader.add_xpath("article_type", self._XP["article_type"])
 
         # Get the product name, such as Adidas Originals Velvet Vibes Hooded Track Top
-        loader.add_css("product_name", "h1::text")
+        loader.add_xpath("product_name", self._XP["product_name"])
 
         # Get the product url
         loader.add_value("product_url", response.url)
 
         # Get the brand name for the product, such as Adidas
-        loader.add_css("brand_name", "div.product-description span a strong::text")
+        loader.add_xpath("brand_name", self._XP["brand_name"])
 
         # Get the price from the website
         loader.add_value("price", data_json['price']['current'])
@@ -119,11 +155,11 @@ class AsosSpider(scrapy.Spider):
         loader.add_value("colors", colors)
 
         # Get the details and care information
-        loader.add_css("details_and_care_info", "div.about-me span::text")
-        loader.add_css("details_and_care_list", "div.care-info span::text")
+        loader.add_xpath("details_and_care_info", self._XP["details_and_care_info"])
+        loader.add_xpath("details_and_care_list", self._XP["details_and_care_list"])
 
         # image_urls and images are used for the download pipeline
-        loader.add_css("image_urls", "li a img::attr(src)")
+        loader.add_xpath("image_urls", self._XP["image_urls"])
         loader.add_value("images", None)
 
         # Add the spider name so we can use it to organize our json lines files
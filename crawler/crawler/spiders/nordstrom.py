@@ -3,9 +3,10 @@
 import os
 import logging
 from logging.handlers import RotatingFileHandler
-from urllib.parse import urlencode, urlunparse, urlparse, parse_qs
 import scrapy
 from scrapy.loader import ItemLoader
+from parsel.csstranslator import HTMLTranslator
+from yarl import URL
 from ..items import NordstromItem
 
 
@@ -20,15 +21,33 @@ class NordstromSpider(scrapy.Spider):
     Attributes:
         name (str): The name of the spider.
         start_urls (list): The urls to crawl from the start.
+        _XP (dict): XPath expressions for the item fields, precomputed from the CSS selectors in _SEL.
+        _seen (set): Article links that already had a request built for them during this crawl.
 
     """
 
     name = "nordstrom"
     start_urls = ["http://shop.nordstrom.com/?origin=tab-logo"]
 
+    # CSS selectors used by parse_item, translated into XPath once for the class rather than on every response
+    _SEL = {
+        "product_name": "section[class=np-product-title] h1::text",
+        "brand_name": "section[class=brand-title] h2 a span::text",
+        "price": "div[class=current-price]::text",
+        "fit": "section.size-filter div[class=drop-down-options] div[class=option-main-text]::text",
+        "width": "section.width-filter div[class=drop-down-options] div[class=option-main-text]::text",
+        "colors": "section.color-filter div[class=color-option-text] div[class=option-main-text]::text",
+        "size_info": "div.extended-product-details div.np-size-info span::text",
+        "details_and_care_info": "div.product-details-and-care div.item-description-body p::text",
+        "details_and_care_list": "div.product-details-and-care ul li::text",
+        "image_urls": "li.image-thumbnail img::attr(src)",
+    }
+    _XP = {field: HTMLTranslator().css_to_xpath(css) for field, css in _SEL.items()}
+
     def __init__(self):
         """Initialize the spider by setting up the logger and make sure the directory exists for the logger."""
         super(NordstromSpider, self).__init__()
+        self._seen = set()
         if not os.path.exists("logs"):
             os.makedirs("logs")
         logging.getLogger().addHandler(RotatingFileHandler(f"logs/{self.name}.txt", maxBytes=1024000, backupCount=100))
@@ -43,15 +62,13 @@ class NordstromSpider(scrapy.Spider):
 
         """
         # Nordstrom's menus such as under men->shoes->boots are placed under an li html tag, we need to find all the
-        # li tags that has an attribute href that we can move to the next page
-        for product_page in response.css("li a::attr(href)").extract():
+        # li tags that has an attribute href that we can move to the next page. The same link often shows up more than
+        # once, so duplicates are dropped (keeping the order) before building any request
+        for product_page in dict.fromkeys(response.css("li a::attr(href)").getall()):
             # We only want to get 4 items shown on the page at a time, because if there's more than 4 items, then
             # it is only shown when you scroll down
-            url_parts = list(urlparse(response.urljoin(product_page)))
-            query = dict(parse_qs(url_parts[4]))
-            query.update({"top": 4, "page": 1})
-            url_parts[4] = urlencode(query)
-            request = scrapy.Request(urlunparse(url_parts), callback=self.parse_article)
+            url = URL(response.urljoin(product_page)).update_query(top=4, page=1)
+            request = scrapy.Request(str(url), callback=self.parse_article)
 
             # Remember the page that we are on
             request.meta["page"] = 1
@@ -66,23 +83,29 @@ class NordstromSpider(scrapy.Spider):
         """
         # Get the type of clothing this series belongs to, such as
         # Home/Women/Designer Collections/Designer Clothing/Dresses
-        article_type = response.css("li a span[itemprop=name]::text").extract()
+        article_type = response.css("li a span[itemprop=name]::text").getall()
 
         # Make sure that we can get the article_type, since there's a lot of web pages that might not have an
         # article type, then we are sure that it doesn't show us any articles
         if article_type:
-            # Find each articles (pictures) that has an href of them, they will link us to the product page
-            articles = response.css(".product-photo-href::attr(href)").extract()
+            # Find each articles (pictures) that has an href of them, they will link us to the product page. Duplicate
+            # links are dropped while keeping the order
+            articles = list(dict.fromkeys(response.css(".product-photo-href::attr(href)").getall()))
 
             # A flag to tell us not to traverse to the next page
             end_of_articles = False
 
+            # Articles that were already requested from an earlier page (the grid can shift while we page through it)
+            # are skipped here, before a request is built and has to go through the scheduler and dupefilter
+            new_articles = [article for article in articles if article not in self._seen]
+            self._seen.update(new_articles)
+
             # If we reached the end of the page, then there are no more articles
             if articles:
                 # For each article (or clothing) in each of Nordstrom's product page (the 4x16 grid) contains a class
                 # called product-photo-href, we would need to get the class and then get the href attribute so we can
                 # enter in the page of the actual product.
-                for article in articles:
+                for article in new_articles:
                     # The next page would be the response joined with the article
                     next_page = response.urljoin(article)
                     # Remember the article_type, which is Home/Women/Designer Collections/Designer Clothing/Dresses
@@ -99,12 +122,9 @@ class NordstromSpider(scrapy.Spider):
                 # We want to get the next page, which is basically response's page + 1, then we would also bring this
                 # incremented value to the next particle. If the next page doesn't have anymore articles we would then
                 # stop going to the next page
-                url_parts = list(urlparse(response.url))
-                query = dict(parse_qs(url_parts[4]))
                 next_page_num = response.meta["page"] + 1
-                query.update({"top": 4, "page": next_page_num})
-                url_parts[4] = urlencode(query)
-                request = scrapy.Request(urlunparse(url_parts), callback=self.parse_article)
+                url = URL(response.url).update_query(top=4, page=next_page_num)
+                request = scrapy.Request(str(url), callback=self.parse_article)
                 request.meta["page"] = next_page_num
                 yield request
 
@@ -122,35 +142,35 @@ class NordstromSpider(scrapy.Spider):
         loader.add_value("article_type", response.meta["article_type"])
 
         # Get the product name, such as Coos Long Bomber Jacket
-        loader.add_css("product_name", "section[class=np-product-title] h1::text")
+        loader.add_xpath("product_name", self._XP["product_name"])
 
         # Get the product url
         loader.add_value("product_url", response.url)
 
         # Get the brand name for the product, such as ACNE STUDIOS
-        loader.add_css("brand_name", "section[class=brand-title] h2 a span::text")
+        loader.add_xpath("brand_name", self._XP["brand_name"])
 
         # Get the price from the webpage
-        loader.add_css("price", "div[class=current-price]::text")
+        loader.add_xpath("price", self._XP["price"])
 
         # Get the size of the article, this could be sizes like numbers
-        loader.add_css("fit", "section.size-filter div[class=drop-down-options] div[class=option-main-text]::text")
+        loader.add_xpath("fit", self._XP["fit"])
 
         # Get the width of the article, this happens with shoes
-        loader.add_css("width", "section.width-filter div[class=drop-down-options] div[class=option-main-text]::text")
+        loader.add_xpath("width", self._XP["width"])
 
         # Get the color of the article
-        loader.add_css("colors", "section.color-filter div[class=color-option-text] div[class=option-main-text]::text")
+        loader.add_xpath("colors", self._XP["colors"])
 
         # The size info are sentences describing the sizes
-        loader.add_css("size_info", "div.extended-product-details div.np-size-info span::text")
+        loader.add_xpath("size_info", self._XP["size_info"])
 
         # Get the details and care information
-        loader.add_css("details_and_care_info", "div.product-details-and-care div.item-description-body p::text")
-        loader.add_css("details_and_care_list", "div.product-details-and-care ul li::text")
+        loader.add_xpath("details_and_care_info", self._XP["details_and_care_info"])
+        loader.add_xpath("details_and_care_list", self._XP["details_and_care_list"])
 
         # image_urls and images are used for the download pipeline
-        loader.add_css("image_urls", "li.image-thumbnail img::attr(src)")
+        loader.add_xpath("image_urls", self._XP["image_urls"])
         loader.add_value("images", None)
 
         # Add the spider name so we can use it to organize our json lines files
@@ -0,0 +1,82 @@
+"""Unit tests for the asos spider."""
+
+import json
+import os
+import re
+import unittest
+from parsel import Selector
+from crawler.crawler.spiders.asos import _load_product_json
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _read_fixture(name):
+    """Read a fixture file as bytes.
+
+    Args:
+        name (str): File name inside the fixtures folder.
+
+    Returns:
+        body (bytes): The content of the fixture.
+
+    """
+    with open(os.path.join(FIXTURES, name), 'rb') as fixture:
+        return fixture.read()
+
+
+def _load_product_json_with_xpath(body):
+    """Load the product json the way AsosSpider.parse_item used to, with XPath, two re.sub calls and json.loads.
+
+    Args:
+        body (bytes): The body of a product page response.
+
+    Returns:
+        data_json (dict): The product json, or None if the page doesn't have one.
+
+    """
+    data = Selector(text=body.decode('utf-8')).xpath(
+        '//script[contains(., "Pages/FullProduct")]/text()').re_first(r"view\('(\{.*\})',")
+    if not data:
+        return None
+    data_cleaned = re.sub(r'[\\]+"', r'\"', data)
+    data_cleaned = re.sub(r"[\\]+'", r"'", data_cleaned)
+    return json.loads(data_cleaned)
+
+
+class LoadProductJsonTest(unittest.TestCase):
+
+    """Tests for loading the product json blob from an asos product page."""
+
+    def test_matches_xpath_and_json_loads(self):
+        """The product json is the same as the one loaded through XPath and json.loads."""
+        body = _read_fixture("asos_product.html")
+        self.assertEqual(_load_product_json(body), _load_product_json_with_xpath(body))
+
+    def test_escaped_quotes(self):
+        """Escaped single and double quotes are loaded as plain quotes."""
+        data_json = _load_product_json(_read_fixture("asos_product.html"))
+        self.assertEqual(data_json['name'], "ASOS DESIGN Men's skinny jeans")
+        self.assertEqual(data_json['description'], 'A "skinny" fit with a 5" rise, it\'s stretchy')
+        self.assertEqual(data_json['price']['current'], "$40.00")
+        self.assertEqual(len(data_json['variants']), 3)
+
+    def test_product_json_in_another_script(self):
+        """A Pages/FullProduct mention outside the product script doesn't pick up another script's view call."""
+        body = (b'<html><head><link rel="preload" href="/Pages/FullProduct/FullProduct.js"></head><body>'
+                b"<script>view('{\"name\":\"Recently viewed\"}', {});</script>"
+                + _read_fixture("asos_product.html") + b"</body></html>")
+        data_json = _load_product_json(body)
+        self.assertEqual(data_json['name'], "ASOS DESIGN Men's skinny jeans")
+
+    def test_minified_page(self):
+        """On a page that is all on one line, the product json stops at the end of its own script."""
+        body = (b"<html><body><script>require(['Pages/FullProduct/FullProduct'], function (view) {"
+                b"view('{\"name\":\"A\"}', {\"lang\":\"en-US\"});});</script><script>f('{\"b\":1}', 2);</script>"
+                b"</body></html>")
+        self.assertEqual(_load_product_json(body), {"name": "A"})
+        self.assertEqual(_load_product_json(body), _load_product_json_with_xpath(body))
+
+    def test_page_without_product_json(self):
+        """Pages without the product json, such as set product pages, give None."""
+        body = b"<html><body><script>require(['Pages/FullProduct/FullProduct']);</script></body></html>"
+        self.assertIsNone(_load_product_json(body))
@@ -0,0 +1,186 @@
+"""Unit tests for the item exporters."""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import zstandard
+from crawler.crawler.item_exporters import JsonLinesItemSplitFileExporter
+from crawler.crawler.items import AsosItem
+
+
+def _read_lines(path):
+    """Decompress every zstd frame of a json lines file and load its lines.
+
+    Args:
+        path (str): Path of the .jl.zst file.
+
+    Returns:
+        lines (list): The json lines loaded into python objects.
+
+    """
+    with open(path, 'rb') as compressed:
+        reader = zstandard.ZstdDecompressor().stream_reader(compressed, read_across_frames=True)
+        return [orjson.loads(line) for line in io.BytesIO(reader.read())]
+
+
+def _count_frames(path):
+    """Count the zstd frames in a file, including empty ones.
+
+    Args:
+        path (str): Path of the .jl.zst file.
+
+    Returns:
+        frames (int): Number of zstd frames.
+
+    """
+    with open(path, 'rb') as compressed:
+        data = compressed.read()
+    frames = 0
+    while data:
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        decompressor.decompress(data)
+        data = decompressor.unused_data
+        frames += 1
+    return frames
+
+
+def _item(number, article_type=("Men", "Jeans")):
+    """Create an item with a numbered product name.
+
+    Args:
+        number (int): Number to put in the product name.
+        article_type (tuple): The article_type of the item.
+
+    Returns:
+        item (AsosItem): The item.
+
+    """
+    return AsosItem(article_type=list(article_type), product_name=f"product {number}", spider_name="asos")
+
+
+class JsonLinesItemSplitFileExporterTest(unittest.TestCase):
+
+    """Tests for exporting items into one json lines file per article_type."""
+
+    def setUp(self):
+        """Export into a temporary folder, since the files are written under scraped_data in the current folder."""
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.mkdtemp()
+        os.chdir(self.tmp)
+
+    def tearDown(self):
+        """Go back to the original folder and remove the temporary one."""
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp)
+
+    def test_article_type_path(self):
+        """The article_type list becomes folders, with the last article type as the file name."""
+        exporter = JsonLinesItemSplitFileExporter()
+        exporter.export_item(AsosItem(article_type=["Men", "Jeans"], product_name="Skinny", spider_name="asos"))
+        exporter.export_item(AsosItem(article_type=["Men"], product_name="Belt", spider_name="asos"))
+        exporter.finish_exporting()
+        self.assertEqual(_read_lines("scraped_data/asos/Men/Jeans.jl.zst"),
+                         [{"article_type": ["Men", "Jeans"], "product_name": "Skinny", "image_urls": [],
+                           "spider_name": "asos"}])
+        self.assertEqual(_read_lines("scraped_data/asos/Men.jl.zst")[0]["product_name"], "Belt")
+
+    def test_empty_article_type(self):
+        """Items without an article_type go into the spider's uncategorized file, not next to the spider's folder."""
+        exporter = JsonLinesItemSplitFileExporter()
+        exporter.export_item(AsosItem(article_type=[], product_name="Skinny", spider_name="asos"))
+        exporter.export_item(AsosItem(product_name="Belt", spider_name="asos"))
+        exporter.finish_exporting()
+        self.assertEqual(os.listdir("scraped_data"), ["asos"])
+        lines = _read_lines("scraped_data/asos/uncategorized.jl.zst")
+        self.assertEqual([line["product_name"] for line in lines], ["Skinny", "Belt"])
+
+    def test_dict_item(self):
+        """Items are read through ItemAdapter, so plain dict items work too."""
+        exporter = JsonLinesItemSplitFileExporter()
+        exporter.export_item({"article_type": ["Women", "Dresses"], "product_name": "Wrap", "spider_name": "asos"})
+        exporter.finish_exporting()
+        self.assertEqual(_read_lines("scraped_data/asos/Women/Dresses.jl.zst")[0]["product_name"], "Wrap")
+
+    def _export(self, count, batch_item_count):
+        """Export numbered items into scraped_data/asos/Men/Jeans.jl.zst.
+
+        Args:
+            count (int): Number of items to export.
+            batch_item_count (int): Number of items per zstd frame.
+
+        Returns:
+            path (str): Path of the exported file.
+
+        """
+        exporter = JsonLinesItemSplitFileExporter(batch_item_count=batch_item_count)
+        for number in range(count):
+            exporter.export_item(_item(number))
+        exporter.finish_exporting()
+        return "scraped_data/asos/Men/Jeans.jl.zst"
+
+    def test_round_trip(self):
+        """Every exported item decompresses back into its own line, in order, in a single frame."""
+        path = self._export(5, 0)
+        self.assertEqual([line["product_name"] for line in _read_lines(path)], [f"product {n}" for n in range(5)])
+        self.assertEqual(_count_frames(path), 1)
+
+    def test_batch_frames(self):
+        """A frame is finished for every batch, plus one for the items left over."""
+        path = self._export(7, 3)
+        self.assertEqual([line["product_name"] for line in _read_lines(path)], [f"product {n}" for n in range(7)])
+        self.assertEqual(_count_frames(path), 3)
+
+    def test_batch_frames_exact_multiple(self):
+        """When the last batch is complete, closing the file doesn't add an empty frame."""
+        path = self._export(6, 3)
+        self.assertEqual(len(_read_lines(path)), 6)
+        self.assertEqual(_count_frames(path), 2)
+
+    def test_appending_crawls(self):
+        """A second crawl appends its own frame, and the file decompresses into the lines of both crawls."""
+        self._export(2, 0)
+        path = self._export(3, 0)
+        self.assertEqual(len(_read_lines(path)), 5)
+        self.assertEqual(_count_frames(path), 2)
+
+    def test_batch_counts_per_file(self):
+        """Each file counts its own items towards a batch."""
+        exporter = JsonLinesItemSplitFileExporter(batch_item_count=2)
+        for number in range(3):
+            exporter.export_item(_item(number, ("Men", "Jeans")))
+            exporter.export_item(_item(number, ("Women",)))
+        exporter.export_item(_item(3, ("Women",)))
+        exporter.finish_exporting()
+        self.assertEqual(_count_frames("scraped_data/asos/Men/Jeans.jl.zst"), 2)
+        self.assertEqual(_count_frames("scraped_data/asos/Women.jl.zst"), 2)
+        self.assertEqual(len(_read_lines("scraped_data/asos/Women.jl.zst")), 4)
+
+    def test_finished_batch_readable_while_exporting(self):
+        """A finished batch is on disk and can be read before finish_exporting."""
+        exporter = JsonLinesItemSplitFileExporter(batch_item_count=2)
+        for number in range(3):
+            exporter.export_item(_item(number))
+        lines = _read_lines("scraped_data/asos/Men/Jeans.jl.zst")
+        self.assertEqual([line["product_name"] for line in lines], ["product 0", "product 1"])
+        exporter.finish_exporting()
+        self.assertEqual(len(_read_lines("scraped_data/asos/Men/Jeans.jl.zst")), 3)
+
+    def test_concurrent_export(self):
+        """Items exported from several threads at once all end up as whole lines in the right files."""
+        exporter = JsonLinesItemSplitFileExporter(batch_item_count=16)
+        article_types = [("Men", "Jeans"), ("Women",)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(exporter.export_item, _item(number, article_types[number % 2]))
+                           for number in range(400)]:
+                future.result()
+        exporter.finish_exporting()
+        men = _read_lines("scraped_data/asos/Men/Jeans.jl.zst")
+        women = _read_lines("scraped_data/asos/Women.jl.zst")
+        self.assertEqual(sorted(line["product_name"] for line in men),
+                         sorted(f"product {n}" for n in range(0, 400, 2)))
+        self.assertEqual(sorted(line["product_name"] for line in women),
+                         sorted(f"product {n}" for n in range(1, 400, 2)))
@@ -0,0 +1,38 @@
+"""Unit tests for the item processors."""
+
+import unittest
+from crawler.crawler.processors import RemoveSaleHome
+
+
+class RemoveSaleHomeTest(unittest.TestCase):
+
+    """Tests for removing the Home and Sale breadcrumbs from article_type."""
+
+    def setUp(self):
+        """Create the processor under test."""
+        self.processor = RemoveSaleHome()
+
+    def test_empty(self):
+        """An empty article_type is left alone."""
+        self.assertEqual(self.processor([]), [])
+
+    def test_single_home(self):
+        """A single Home breadcrumb is removed without looking for Sale."""
+        self.assertEqual(self.processor(["Home"]), [])
+
+    def test_single_other(self):
+        """A single breadcrumb that isn't Home is kept."""
+        self.assertEqual(self.processor(["Women"]), ["Women"])
+
+    def test_home(self):
+        """Home is removed from the first breadcrumb."""
+        self.assertEqual(self.processor(["Home", "Women", "Dresses"]), ["Women", "Dresses"])
+
+    def test_home_and_sale(self):
+        """Home and Sale are both removed, regardless of their case."""
+        self.assertEqual(self.processor(["HOME", "sale", "Women", "Dresses"]), ["Women", "Dresses"])
+
+    def test_sale_prefix(self):
+        """Breadcrumbs starting with Sale are removed, but ones that only contain it later are kept."""
+        self.assertEqual(self.processor(["Home", "Sale Shoes", "Boots"]), ["Boots"])
+        self.assertEqual(self.processor(["Home", "Women on Sale", "Boots"]), ["Women on Sale", "Boots"])